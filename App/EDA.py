@@ -1,19 +1,17 @@
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy.stats import skew, kurtosis
+from Feature_Store import FILE_MAPPING, load_raw
 
 def app():
     st.title("Exploratory Data Analysis (EDA)")
 
     # File mapping and format selection
-    file_mapping = {"T20": "t20.csv", "ODI": "ODI data.csv", "Test": "test.csv"}
-    format_choice = st.selectbox("Select Format:", list(file_mapping.keys()))
-    data = pd.read_csv(file_mapping[format_choice])
+    format_choice = st.selectbox("Select Format:", list(FILE_MAPPING.keys()))
 
-    # Remove columns that include "Unnamed" in their names
-    data = data.loc[:, ~data.columns.str.contains("Unnamed")]
+    # '-' entries are read as missing so the numeric columns are included
+    data = load_raw(format_choice)
 
     
     # Extract numeric data
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.inspection import partial_dependence, permutation_importance
+
+from Feature_Store import read_cache, write_cache
+
+# Explanations are cached here, one file per (model registry key, dataset hash, settings)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".explain_cache")
+
+
+def model_key(model, X_train, y_train):
+    """
+    Registry key for a model: its class, hyperparameters and training data.
+
+    Computed once when the model is trained, so models fitted on different
+    data get different keys without hashing the fitted estimator.
+    """
+    params = {name: repr(value) for name, value in model.get_params().items()}
+    payload = json.dumps({"model": type(model).__name__, "params": params}, sort_keys=True)
+    return hashlib.sha256((payload + dataset_hash(X_train, y_train)).encode()).hexdigest()[:16]
+
+
+def dataset_hash(X, y):
+    """Hash of the evaluation data, so cached explanations are invalidated when it changes."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _cached(kind, key, settings, compute):
+    # Load a cached result if it exists, otherwise compute and store it
+    suffix = "_".join(f"{name}{value}" for name, value in sorted(settings.items()))
+    path = os.path.join(CACHE_DIR, f"{kind}__{key}__{suffix}.joblib")
+    result = read_cache(path, joblib.load)
+    if result is None:
+        result = compute()
+        write_cache(result, path, joblib.dump)
+    return result
+
+
+def compute_permutation_importance(model, X, y, cache_key, n_repeats=10, n_jobs=-1, random_state=42):
+    """
+    Permutation importance of each feature, averaged over n_repeats shuffles.
+
+    Features are permuted in parallel across n_jobs workers. Results are cached
+    under cache_key (model key + evaluation data hash). Returns a DataFrame with
+    the mean and standard deviation of the drop in R² per feature.
+    """
+    settings = {"repeats": n_repeats, "seed": random_state}
+
+    def compute():
+        result = permutation_importance(
+            model, X, y, n_repeats=n_repeats, n_jobs=n_jobs, random_state=random_state
+        )
+        return pd.DataFrame({
+            "Feature": X.columns,
+            "Importance": result.importances_mean,
+            "Std": result.importances_std,
+        }).sort_values(by="Importance", ascending=False)
+
+    return _cached("permutation", cache_key, settings, compute)
+
+
+def _partial_dependence(model, X, feature, grid_resolution):
+    result = partial_dependence(model, X, [feature], grid_resolution=grid_resolution)
+    # 'values' was renamed to 'grid_values' in scikit-learn 1.3
+    grid = result["grid_values"] if "grid_values" in result else result["values"]
+    return feature, np.asarray(grid[0]), np.asarray(result["average"][0])
+
+
+def compute_partial_dependence(model, X, cache_key, features=None, grid_resolution=20, n_jobs=-1):
+    """
+    Partial-dependence grids for the given features (all columns by default).
+
+    Each feature's grid is computed in parallel across n_jobs workers. Results
+    are cached under cache_key. Returns a dict mapping feature name to a
+    (grid values, average prediction) tuple.
+    """
+    features = list(X.columns) if features is None else list(features)
+    settings = {"grid": grid_resolution, "features": hashlib.sha256("|".join(features).encode()).hexdigest()[:8]}
+
+    def compute():
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_partial_dependence)(model, X, feature, grid_resolution) for feature in features
+        )
+        return {feature: (grid, average) for feature, grid, average in results}
+
+    return _cached("partial_dependence", cache_key, settings, compute)
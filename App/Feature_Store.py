@@ -0,0 +1,166 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+FILE_MAPPING = {"T20": "t20.csv", "ODI": "ODI data.csv", "Test": "test.csv"}
+
+# Derived columns are cached here, one pickle per (format, feature, version, data hash)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feature_store")
+
+
+def _safe_divide(numerator, denominator):
+    # Vectorized division that yields NaN instead of inf when the denominator is 0 or missing
+    numerator = numerator.astype(float)
+    denominator = denominator.astype(float)
+    return numerator.div(denominator.where(denominator > 0))
+
+
+def boundary_pct(data):
+    """Percentage of runs scored in fours and sixes."""
+    return _safe_divide(data["4s"] * 4 + data["6s"] * 6, data["Runs"]) * 100
+
+
+def conversion_rate(data):
+    """Percentage of fifty-plus scores that were converted into hundreds."""
+    return _safe_divide(data["100"], data["100"] + data["50"]) * 100
+
+
+def duck_rate(data):
+    """Percentage of innings that ended in a duck."""
+    return _safe_divide(data["0"], data["Inns"]) * 100
+
+
+def balls_per_dismissal(data):
+    """Balls faced per dismissal (innings minus not-outs); balls faced if never dismissed."""
+    dismissals = data["Inns"] - data["NO"]
+    # Never dismissed: balls faced is a lower bound on balls per dismissal
+    return _safe_divide(data["BF"], dismissals).where(dismissals != 0, data["BF"].astype(float))
+
+
+def career_length(data):
+    """Career length in years from the 'Span' column, e.g. '1989-2012' -> 24."""
+    years = data["Span"].astype(str).str.extract(r"(\d{4})\s*-\s*(\d{4})").astype(float)
+    return years[1] - years[0] + 1
+
+
+# name -> (version, function, required raw columns)
+# Bump the version when a feature's definition changes so its cached column is recomputed.
+FEATURES = {
+    "Boundary %": (1, boundary_pct, ["4s", "6s", "Runs"]),
+    "Conversion Rate": (1, conversion_rate, ["100", "50"]),
+    "Duck Rate": (1, duck_rate, ["0", "Inns"]),
+    "Balls per Dismissal": (2, balls_per_dismissal, ["BF", "Inns", "NO"]),
+    "Career Length": (1, career_length, ["Span"]),
+}
+
+
+def data_hash(format_choice):
+    """Hash of the raw CSV bytes, used to invalidate cached features when the data changes."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), FILE_MAPPING[format_choice])
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_raw(format_choice):
+    """Load a format's CSV with '-' treated as missing and 'Unnamed' columns removed."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), FILE_MAPPING[format_choice])
+    data = pd.read_csv(path, na_values=['-', 'NA', ''])
+    return data.loc[:, ~data.columns.str.contains("Unnamed")]
+
+
+def available_features(data):
+    """Names of the derived features whose required columns exist in the given data."""
+    return [name for name, (_, _, required) in FEATURES.items()
+            if all(column in data.columns for column in required)]
+
+
+def _cache_path(format_choice, name, version, digest):
+    slug = "".join(c if c.isalnum() else "_" for c in name.lower()).strip("_")
+    return os.path.join(CACHE_DIR, format_choice, f"{slug}__v{version}__{digest}.pkl")
+
+
+def read_cache(path, load):
+    """Load a cache file with `load`, returning None if it is missing or truncated/corrupt."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return load(path)
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+
+
+def write_cache(obj, path, dump):
+    """
+    Write a cache file with `dump(obj, path)`.
+
+    The file is written to a temp file in the same directory and moved into
+    place, so concurrent sessions never read a half-written file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def get_feature(format_choice, name, data=None, digest=None):
+    """Return a single derived column, computing and caching it on disk if needed."""
+    version, func, _ = FEATURES[name]
+    digest = digest or data_hash(format_choice)
+    path = _cache_path(format_choice, name, version, digest)
+
+    column = read_cache(path, pd.read_pickle)
+    if column is not None:
+        return column.rename(name)
+
+    if data is None:
+        data = load_raw(format_choice)
+    column = func(data).replace([np.inf, -np.inf], np.nan).rename(name)
+
+    write_cache(column, path, pd.to_pickle)
+    return column
+
+
+def load_features(format_choice, names=None):
+    """
+    Load a format's raw data joined with its derived feature columns.
+
+    Only features missing from the on-disk cache are computed, so adding a new
+    feature to FEATURES computes just that column.
+    """
+    data = load_raw(format_choice)
+    digest = data_hash(format_choice)
+    names = available_features(data) if names is None else names
+
+    derived = [get_feature(format_choice, name, data=data, digest=digest) for name in names]
+    if not derived:
+        return data
+    return pd.concat([data] + derived, axis=1)
+
+
+@st.cache_data
+def _cached_features(format_choice, digest, signature, names):
+    # digest and signature are only part of the Streamlit cache key
+    return load_features(format_choice, None if names is None else list(names))
+
+
+def cached_features(format_choice, names=None):
+    """
+    Streamlit-cached load_features shared by the pages.
+
+    The CSV hash and the (name, version) pairs of FEATURES are part of the cache
+    key, so an edited CSV or a new/bumped feature is picked up on the next rerun
+    instead of waiting for a process restart.
+    """
+    signature = tuple((name, version) for name, (version, _, _) in FEATURES.items())
+    names = None if names is None else tuple(names)
+    return _cached_features(format_choice, data_hash(format_choice), signature, names)
@@ -6,17 +6,30 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import matplotlib.pyplot as plt
 import seaborn as sns
+from Feature_Store import FILE_MAPPING, FEATURES, cached_features
+from Explainability import compute_permutation_importance, compute_partial_dependence, dataset_hash, model_key
+
+RAW_FEATURES = ["Mat", "Inns", "NO", "BF", "SR"]
+
+# Derived features computed from the target ('Runs') would leak it into the model, so they are left out
+DERIVED_FEATURES = [name for name, (_, _, required) in FEATURES.items() if "Runs" not in required]
+
+
+@st.cache_resource
+def train_model(X_train, y_train):
+    # Cached so the forest is not retrained on every rerun (e.g. when changing the partial-dependence feature);
+    # the registry key is computed once here rather than on every explanation lookup
+    model = RandomForestRegressor(random_state=42)
+    model.fit(X_train, y_train)
+    return model, model_key(model, X_train, y_train)
+
 
 def app():
     st.title("Enhanced Machine Learning Model with Interpretations")
-    file_mapping = {"T20": "t20.csv", "ODI": "ODI data.csv", "Test": "test.csv"}
 
     # File selection
-    format_choice = st.selectbox("Select Format:", list(file_mapping.keys()))
-    data = pd.read_csv(file_mapping[format_choice], na_values=['-', 'NA', ''])
-
-    # Remove columns that include "Unnamed" in their names
-    data = data.loc[:, ~data.columns.str.contains("Unnamed")]
+    format_choice = st.selectbox("Select Format:", list(FILE_MAPPING.keys()))
+    data = cached_features(format_choice).copy()
 
     # Dataset Overview
     st.subheader(f"{format_choice} Dataset Overview")
@@ -34,27 +47,36 @@ def app():
     st.write("""
     **Interpretation:**
     - The dataset has several columns representing various batting metrics like matches played, innings, not-outs, balls faced, and strike rate.
+    - Derived metrics such as boundary percentage, conversion rate, duck rate, balls per dismissal and career length are added where the format provides the columns they need.
+    - Boundary percentage is computed from 'Runs', so it is shown here but not used as a model feature (it would leak the target into the model).
+    - Derived ratios that are undefined for a player (e.g. no fifty-plus score) get a "missing" indicator column rather than being treated as 0.
     - The missing values and data types are shown for your review. We will handle missing data in our model to ensure accurate predictions.
     """)
 
     # Selecting Features
-    features = ["Mat", "Inns", "NO", "BF", "SR"]
+    features = RAW_FEATURES + DERIVED_FEATURES
     target = "Runs"
     features = [feature for feature in features if feature in data.columns]
 
     # Normalize column names for consistency
     data.columns = data.columns.str.strip().str.lower()  # Remove whitespace and convert to lowercase
     features = [feature.lower() for feature in features]  # Normalize features list
+    raw_features = [feature.lower() for feature in RAW_FEATURES if feature.lower() in features]
+    derived_features = [feature.lower() for feature in DERIVED_FEATURES if feature.lower() in features]
     target = target.lower()  # Normalize target name
 
     if all(feature in data.columns for feature in features + [target]):
         # Prepare data
-        X = data[features]
-        y = data[target]
-
         # Handle missing values
-        X.fillna(0, inplace=True)  # Replace NaN in features with 0
-        y.fillna(y.mean(), inplace=True)  # Replace NaN in target with mean
+        X = data[features].copy()
+        # Derived ratios are NaN when undefined (e.g. no fifty-plus score), not zero:
+        # flag them with an indicator column before filling
+        for feature in derived_features:
+            missing = X[feature].isna()
+            if missing.any():
+                X[f"{feature} missing"] = missing.astype(int)
+        X = X.fillna(0)  # Replace remaining NaN in features with 0
+        y = data[target].fillna(data[target].mean())  # Replace NaN in target with mean
 
         # Categorical Encoding (if applicable)
         categorical_columns = X.select_dtypes(include=['object']).columns
@@ -78,8 +100,8 @@ def app():
         """)
 
         # Train model
-        model = RandomForestRegressor(random_state=42)
-        model.fit(X_train, y_train)
+        model, registry_key = train_model(X_train, y_train)
+        explain_key = f"{registry_key}__{dataset_hash(X_test, y_test)}"
 
         # Predictions
         predictions = model.predict(X_test)
@@ -125,10 +147,46 @@ def app():
         ax.set_title("Feature Importance")
         st.pyplot(fig)
 
+        # Permutation Importance (cached against the model key and test-set hash)
+        st.subheader("Permutation Importance")
+        perm_importance = compute_permutation_importance(model, X_test, y_test, explain_key, n_repeats=10, n_jobs=-1)
+        st.write(perm_importance)
+
+        fig, ax = plt.subplots()
+        ax.barh(perm_importance["Feature"], perm_importance["Importance"], xerr=perm_importance["Std"], color="lightgreen")
+        ax.set_xlabel("Mean decrease in R²")
+        ax.set_title("Permutation Importance")
+        st.pyplot(fig)
+
+        st.write("""
+        **Interpretation:**
+        - Permutation importance measures how much the model's R² drops on the test set when a feature's values are shuffled.
+        - Unlike impurity-based importance, it is not biased towards features with many distinct values, so it is more reliable for correlated features like 'Inns' and 'BF'.
+        - The error bars show the variation across repeated shuffles.
+        """)
+
+        # Partial Dependence
+        st.subheader("Partial Dependence")
+        pd_results = compute_partial_dependence(model, X_test, explain_key, grid_resolution=20, n_jobs=-1)
+        pd_feature = st.selectbox("Select Feature:", list(pd_results.keys()))
+        grid, average = pd_results[pd_feature]
+        fig, ax = plt.subplots()
+        ax.plot(grid, average, color="purple")
+        ax.set_xlabel(pd_feature)
+        ax.set_ylabel("Predicted Runs")
+        ax.set_title(f"Partial Dependence of Runs on {pd_feature}")
+        st.pyplot(fig)
+
+        st.write("""
+        **Interpretation:**
+        - The partial dependence plot shows how the predicted runs change as the selected feature varies, averaging over all other features.
+        - A flat line means the model barely uses the feature; a steep slope means predictions are sensitive to it.
+        """)
+
         # EDA: Pairplot
         st.subheader("Exploratory Data Analysis")
-        st.write("Pairplot of Selected Features and Target")
-        pairplot_data = data[features + [target]]
+        st.write("Pairplot of Raw Features and Target")
+        pairplot_data = data[raw_features + [target]]
         sns.pairplot(pairplot_data)
         st.pyplot()
 
@@ -3,6 +3,7 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 from scipy.stats import skew, kurtosis
+from Feature_Store import FILE_MAPPING, cached_features
 
 # Set page configuration at the very start
 st.set_page_config(page_title="Cricket Data Analysis", layout="wide")
@@ -12,14 +13,11 @@ def app():
     st.title("Statistical Analysis of Cricket Data")
 
     # File mapping and selection
-    file_mapping = {"T20": "t20.csv", "ODI": "ODI data.csv", "Test": "test.csv"}
-    format_choice = st.selectbox("Select Format:", list(file_mapping.keys()), index=0)
+    format_choice = st.selectbox("Select Format:", list(FILE_MAPPING.keys()), index=0)
 
-    # Load data
-    data = pd.read_csv(file_mapping[format_choice])
-
-    # Remove columns that include "Unnamed" in their names
-    data = data.loc[:, ~data.columns.str.contains("Unnamed")]
+    # Load data along with derived metrics (boundary %, conversion rate, duck rate, ...)
+    # '-' entries are read as missing, so columns like Runs, BF and SR are numeric and included below
+    data = cached_features(format_choice)
 
     # Extract numeric data
     numeric_data = data.select_dtypes(include=["float64", "int64"])